@@ -4,6 +4,8 @@ import numpy as np
 class Ant:
     ALWAYS = 0
     WAY_BACK = 1
+    __slots__ = ('scene', 'graph', 'index', 'is_back_tracing', 'back_trace_list', 'from_node', 'to_node', 'edge',
+                 'process_on_edge', 'has_food', 'speed', 'no_turn_back', 'deposit_on', 'back_trace')
 
     def __init__(self, scene, i):
         self.scene = scene
@@ -15,8 +17,7 @@ class Ant:
         self.to_node = None
         self.edge = None
         self.process_on_edge = 0
-        self._has_food = False
-        self.color = 'brown'
+        self.has_food = False
         # Some parameters that should probably be in params.py
         self.speed = 1
         self.no_turn_back = True
@@ -46,7 +47,6 @@ class Ant:
         """
         progress = dt * self.speed
         self.process_on_edge += progress / self.edge['weight']
-        self.position = self._compute_position()
         if self.has_food:
             self.deposit_pheromone()
         if self.process_on_edge > 1:
@@ -120,36 +120,8 @@ class Ant:
     @property
     def position(self):
         """
-        Obtain current position of the ant.
+        Obtain current position of the ant. Computed on demand from the edge the ant is on.
 
         :return: Current position
         """
-        return self.scene.ant_position_array[self.index]
-
-    @position.setter
-    def position(self, arr):
-        """
-        Position setter. This is not a safe operation; 
-        there is no check if the position corresponds to a point on the graph.
-        
-        :param arr: New position
-        :return: None
-        """
-        self.scene.ant_position_array[self.index] = arr
-
-    @property
-    def has_food(self):
-        """
-        Boolean that indicates whether the ant is currently carrying food
-
-        :return: True if ant has food, false otherwise
-        """
-        return self._has_food
-
-    @has_food.setter
-    def has_food(self, boolean):
-        self._has_food = boolean
-        if boolean:
-            self.color = 'orange'
-        else:
-            self.color = 'brown'
+        return self._compute_position()
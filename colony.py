@@ -0,0 +1,143 @@
+import numpy as np
+
+import kernels
+
+
+class Colony:
+    """
+    Array-based store of all the ants in a scene, moved by one of the kernels in kernels.py.
+    Entry i of each array holds the state that Ant number i would keep in its attributes.
+    The arrays use the smallest types that fit, so that colonies of millions of ants fit in memory:
+    about 18 bytes per ant, plus the back trace.
+    The back trace keeps an entry for every node, for every ant, so its size grows with the graph:
+    a byte per node up to 128 nodes (node ids 0 to 127), two bytes per node beyond that.
+    For 10 million ants that is 200 MB on 20 nodes, 1 GB on 100 nodes and 4 GB on 200 nodes.
+    """
+
+    def __init__(self, scene, backend):
+        """
+        Creates an empty colony. Arrays are allocated in self.prepare()
+
+        :param scene: Scene the colony lives in
+        :param backend: name of the kernel backend moving the ants
+        :return: colony instance
+        """
+        self.scene = scene
+        self.backend = backend
+        self.kernel = kernels.KERNELS[backend]
+        self.no_turn_back = True
+        # Graph
+        self.nest_node = 0
+        self.is_food = None
+        self.edge_list = []
+        self.edge_weight = self.pheromone = None
+        self.neighbours = self.neighbour_edges = self.degree = None
+        # Ants
+        self.from_node = self.to_node = self.edge = None
+        self.progress = self.speed = None
+        self.flags = None
+        self.trace_pred = self.trace_last = None
+
+    def prepare(self):
+        """
+        Convert the graph of the scene to arrays, and release all ants from the nest.
+
+        :return: None
+        """
+        params = self.scene.params
+        graph = self.scene.graph
+        num_nodes = graph.number_of_nodes()
+        num_ants = self.scene.total_ants
+        self.nest_node = self.scene.nest_node
+        self.is_food = np.zeros(num_nodes, dtype=bool)
+        self.is_food[self.scene.food_nodes] = True
+
+        self.edge_list = list(graph.edges())
+        edge_index = {}
+        for index, (n1, n2) in enumerate(self.edge_list):
+            edge_index[n1, n2] = edge_index[n2, n1] = index
+        self.edge_weight = np.array([graph[n1][n2]['weight'] for n1, n2 in self.edge_list])
+        self.pheromone = np.array([graph[n1][n2]['pheromone'] for n1, n2 in self.edge_list])
+        # Neighbours in the order of the graph, padded with -1
+        self.degree = np.array([len(graph[node]) for node in range(num_nodes)])
+        self.neighbours = np.full([num_nodes, max(self.degree.max(), 1)], -1, dtype=np.int32)
+        self.neighbour_edges = np.full(self.neighbours.shape, -1, dtype=np.int32)
+        for node in range(num_nodes):
+            for slot, neighbour in enumerate(graph[node]):
+                self.neighbours[node, slot] = neighbour
+                self.neighbour_edges[node, slot] = edge_index[node, neighbour]
+
+        self.from_node = np.full(num_ants, self.nest_node, dtype=np.int32)
+        self.to_node = np.full(num_ants, self.nest_node, dtype=np.int32)
+        self.edge = np.zeros(num_ants, dtype=np.int32)
+        self.progress = np.full(num_ants, 2, dtype=np.float32)
+        # All ants walk equally fast, so they share a single speed. Both kernels also take a speed per ant.
+        self.speed = np.array([params.ant_speed], dtype=np.float32)
+        self.flags = np.zeros(num_ants, dtype=np.uint8)
+        # Node ids and both sentinels of the back trace
+        trace_type = np.min_scalar_type(-max(num_nodes, -kernels.ROOT))
+        self.trace_pred = np.full([num_ants, num_nodes], kernels.UNVISITED, dtype=trace_type)
+        self.trace_last = np.full(num_ants, kernels.ROOT, dtype=trace_type)
+
+        if params.seed:
+            kernels.seed(self.backend, params.seed)
+        # All ants start out arriving at the nest, so an empty step makes them pick their first edge
+        self.kernel(self, 0, 0)
+
+    @property
+    def has_food(self):
+        """
+        Which ants are carrying food, unpacked from the flags.
+
+        :return: boolean array with an entry for every ant
+        """
+        return (self.flags & kernels.HAS_FOOD) > 0
+
+    @property
+    def is_back_tracing(self):
+        """
+        Which ants are tracing their way back to the nest, unpacked from the flags.
+
+        :return: boolean array with an entry for every ant
+        """
+        return (self.flags & kernels.BACK_TRACING) > 0
+
+    def reset_trace(self, ants):
+        """
+        Clear the back trace of the given ants, leaving only the nest.
+
+        :param ants: indices of the ants
+        :return: None
+        """
+        self.trace_pred[ants] = kernels.UNVISITED
+        self.trace_pred[ants, self.nest_node] = kernels.ROOT
+        self.trace_last[ants] = self.nest_node
+
+    def move(self, dt):
+        """
+        Move all ants one time step, let the pheromone decay and copy it to the graph for drawing.
+
+        :param dt: size of time step
+        :return: None
+        """
+        params = self.scene.params
+        self.kernel(self, dt, params.pheromone_deposit)
+        self.pheromone *= (1 - params.pheromone_decay) ** dt
+        for (n1, n2), pheromone in zip(self.edge_list, self.pheromone):
+            self.scene.graph[n1][n2]['pheromone'] = pheromone
+
+    def positions(self):
+        """
+        Compute the positions of all ants from the edge they are on and their progress along it.
+
+        :return: array of positions
+        """
+        # Computed in place, one coordinate at a time, to keep the temporaries small on large colonies
+        node_positions = self.scene.node_position_array.astype(np.float32)
+        positions = node_positions[self.to_node]
+        for axis in range(positions.shape[1]):
+            start = node_positions[self.from_node, axis]
+            positions[:, axis] -= start
+            positions[:, axis] *= self.progress
+            positions[:, axis] += start
+        return positions
@@ -0,0 +1,218 @@
+"""
+Kernels that move the whole colony one time step at once.
+
+Both kernels follow the semantics of Ant.walk and Ant.pick_new_edge, but work on the arrays of a Colony.
+The NumPy kernel handles every phase (walk, arrival, selection, deposit) for all ants in turn,
+the Numba kernel fuses them into a single compiled pass over the ants.
+"""
+import warnings
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+BACKENDS = ('python', 'numpy', 'numba')
+# Sentinels in the back trace of an ant: node not visited yet, and the first node of the trace.
+UNVISITED = -1
+ROOT = -2
+# Bits in the flags of an ant. Ants pick up food and start back tracing at the same time, and drop both at the nest.
+HAS_FOOD = 1
+BACK_TRACING = 2
+# Arriving ants handled at once by the NumPy kernel, which needs a row of temporaries per neighbour of each ant
+CHUNK_SIZE = 2 ** 18
+
+
+def select_backend(name):
+    """
+    Resolve the requested backend to one that can run here.
+    'auto' uses the compiled kernel when Numba is installed, and the NumPy kernel otherwise.
+
+    :param name: one of 'auto', 'python', 'numpy' or 'numba'
+    :return: name of the backend to use
+    """
+    if name == 'auto':
+        return 'numba' if numba else 'numpy'
+    if name not in BACKENDS:
+        raise ValueError("Unknown kernel backend '%s', pick one of %s" % (name, ', '.join(BACKENDS)))
+    if name == 'numba' and not numba:
+        warnings.warn("Numba is not installed, falling back to the NumPy kernel", RuntimeWarning)
+        return 'numpy'
+    return name
+
+
+def seed(backend, value):
+    """
+    Seed the random generator used by the kernel of the backend.
+    Compiled code does not share the random state of NumPy, so it is seeded separately.
+
+    :param backend: name of the backend
+    :param value: seed
+    :return: None
+    """
+    np.random.seed(value)
+    if backend == 'numba':
+        _seed_compiled(value)
+
+
+def numpy_move(colony, dt, deposit):
+    """
+    Vectorized move of all ants.
+    Unlike the ants moving one by one, all pheromone of this time step is deposited before any ant picks a new edge.
+
+    :param colony: Colony to move
+    :param dt: size of time step
+    :param deposit: pheromone deposit rate
+    :return: None
+    """
+    # Rates per edge, so that only one small array is gathered for all ants
+    rate = (dt / colony.edge_weight).astype(np.float32)
+    if colony.speed.size == 1:
+        colony.progress += (rate * colony.speed[0])[colony.edge]
+    else:
+        colony.progress += rate[colony.edge] * colony.speed
+    carrying = np.flatnonzero(colony.flags & HAS_FOOD)
+    np.add.at(colony.pheromone, colony.edge[carrying], (deposit * dt / colony.edge_weight)[colony.edge[carrying]])
+    numpy_arrive(colony, np.flatnonzero(colony.progress > 1))
+
+
+def numpy_arrive(colony, ants):
+    """
+    Vectorized arrival of the given ants at the end of their edges: pick up or drop food, and pick a new edge.
+    Ants are handled in chunks to bound the size of the temporaries.
+
+    :param colony: Colony the ants belong to
+    :param ants: indices of the arriving ants
+    :return: None
+    """
+    weights = (colony.pheromone + 0.1).astype(np.float32)
+    for start in range(0, len(ants), CHUNK_SIZE):
+        _numpy_arrive_chunk(colony, ants[start:start + CHUNK_SIZE], weights)
+
+
+def _numpy_arrive_chunk(colony, ants, edge_weights):
+    current = colony.to_node[ants]
+    previous = colony.from_node[ants]
+    flags = colony.flags[ants]
+    has_food = (flags & HAS_FOOD) > 0
+    found = colony.is_food[current] & ~has_food
+    returned = (current == colony.nest_node) & has_food
+    recording = found | returned | ((flags & BACK_TRACING) == 0)
+    colony.flags[ants[found]] = HAS_FOOD | BACK_TRACING
+    colony.flags[ants[returned]] = 0
+    colony.reset_trace(ants[returned])
+
+    # Extend the back trace. Only the first visit of a node matters for finding the way back.
+    recorders, nodes = ants[recording], previous[recording]
+    first = colony.trace_pred[recorders, nodes] == UNVISITED
+    colony.trace_pred[recorders[first], nodes[first]] = colony.trace_last[recorders[first]]
+    colony.trace_last[recorders] = nodes
+
+    slots = np.empty(len(ants), dtype=np.intp)
+    tracing = (colony.flags[ants] & BACK_TRACING) > 0
+    tracers, origins = ants[tracing], current[tracing]
+    targets = colony.trace_last[tracers]
+    colony.trace_last[tracers] = colony.trace_pred[tracers, targets]
+    slots[tracing] = (colony.neighbours[origins] == targets[:, None]).argmax(axis=1)
+
+    exploring = ~tracing
+    origins, previous = current[exploring], previous[exploring]
+    candidates = colony.neighbours[origins]
+    valid = candidates >= 0
+    turn_back = colony.no_turn_back & (colony.degree[origins] > 1) & ~(
+            colony.is_food[origins] | (origins == colony.nest_node))
+    valid &= ~(turn_back[:, None] & (candidates == previous[:, None]))
+    weights = np.where(valid, edge_weights[colony.neighbour_edges[origins]], np.float32(0))
+    cumulative = np.cumsum(weights, axis=1)
+    threshold = np.random.random(len(origins)).astype(np.float32) * cumulative[:, -1]
+    choice = (cumulative <= threshold[:, None]).sum(axis=1)
+    last_valid = valid.shape[1] - 1 - valid[:, ::-1].argmax(axis=1)
+    slots[exploring] = np.minimum(choice, last_valid)
+
+    colony.from_node[ants] = current
+    colony.to_node[ants] = colony.neighbours[current, slots]
+    colony.edge[ants] = colony.neighbour_edges[current, slots]
+    colony.progress[ants] = 0
+
+
+def numba_move(colony, dt, deposit):
+    """
+    Compiled move of all ants in a single pass. Ants move one after another, like the Ant objects do.
+
+    :param colony: Colony to move
+    :param dt: size of time step
+    :param deposit: pheromone deposit rate
+    :return: None
+    """
+    _fused_move(colony.from_node, colony.to_node, colony.edge, colony.progress, colony.flags, colony.speed,
+                colony.trace_pred, colony.trace_last, colony.neighbours, colony.neighbour_edges, colony.degree,
+                colony.edge_weight, colony.pheromone, colony.is_food, colony.nest_node, colony.no_turn_back,
+                dt, deposit)
+
+
+def _fused_move(from_node, to_node, edge, progress, flags, speed, trace_pred, trace_last, neighbours,
+                neighbour_edges, degree, edge_weight, pheromone, is_food, nest_node, no_turn_back, dt, deposit):
+    uniform_speed = speed.shape[0] == 1
+    for i in range(progress.shape[0]):
+        weight = edge_weight[edge[i]]
+        progress[i] += dt * speed[0 if uniform_speed else i] / weight
+        has_food = flags[i] & HAS_FOOD
+        if has_food:
+            pheromone[edge[i]] += deposit * dt / weight
+        if progress[i] <= 1:
+            continue
+        current = to_node[i]
+        previous = from_node[i]
+        recording = not flags[i] & BACK_TRACING
+        if is_food[current] and not has_food:
+            flags[i] = HAS_FOOD | BACK_TRACING
+            recording = True
+        elif current == nest_node and has_food:
+            flags[i] = 0
+            trace_pred[i, :] = UNVISITED
+            trace_pred[i, nest_node] = ROOT
+            trace_last[i] = nest_node
+            recording = True
+        if recording:
+            if trace_pred[i, previous] == UNVISITED:
+                trace_pred[i, previous] = trace_last[i]
+            trace_last[i] = previous
+
+        slot = 0
+        if flags[i] & BACK_TRACING:
+            target = trace_last[i]
+            trace_last[i] = trace_pred[i, target]
+            while neighbours[current, slot] != target:
+                slot += 1
+        else:
+            turn_back = no_turn_back and degree[current] > 1 and not (is_food[current] or current == nest_node)
+            total = 0.
+            for k in range(degree[current]):
+                if not (turn_back and neighbours[current, k] == previous):
+                    total += pheromone[neighbour_edges[current, k]] + 0.1
+            threshold = np.random.random() * total
+            cumulative = 0.
+            for k in range(degree[current]):
+                if not (turn_back and neighbours[current, k] == previous):
+                    slot = k
+                    cumulative += pheromone[neighbour_edges[current, k]] + 0.1
+                    if cumulative > threshold:
+                        break
+
+        from_node[i] = current
+        to_node[i] = neighbours[current, slot]
+        edge[i] = neighbour_edges[current, slot]
+        progress[i] = 0
+
+
+def _seed_compiled(value):
+    np.random.seed(value)
+
+
+if numba:
+    _fused_move = numba.njit(cache=True)(_fused_move)
+    _seed_compiled = numba.njit(_seed_compiled)
+
+KERNELS = {'numpy': numpy_move, 'numba': numba_move}
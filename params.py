@@ -24,3 +24,5 @@ class Parameters:
         self.min_path_length = 4
         # Seed for reproducing simulations
         self.seed = 22
+        # Kernel that moves the ants: 'python' (one Ant object per ant), 'numpy', 'numba', or 'auto' for the fastest
+        self.kernel_backend = 'auto'
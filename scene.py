@@ -5,7 +5,9 @@ import random
 import networkx as nx
 import numpy as np
 
+import kernels
 from ant import Ant
+from colony import Colony
 
 
 class Scene:
@@ -29,12 +31,18 @@ class Scene:
 
         self.on_step_functions = []
 
-        self.ant_position_array = self.node_position_array = None
+        self.node_position_array = None
         self.ant_list = []
+        self.colony = None
 
         self.on_step_functions.append(self.move)
 
     def _create_colony(self):
+        backend = kernels.select_backend(self.params.kernel_backend)
+        if backend != 'python':
+            self.colony = Colony(self, backend)
+            self.colony.prepare()
+            return
         for i in range(self.total_ants):
             ant = Ant(self, i)
             self.ant_list.append(ant)
@@ -51,8 +59,6 @@ class Scene:
             random.seed(self.params.seed)
         self._create_graph()
         self._create_colony()
-        self.ant_position_array = np.zeros([self.total_ants, 2])
-        self.ant_position_array[:] = self.node_position_array[self.nest_node]
 
     def create_random_configuration(self):
         return np.random.rand(self.params.num_nodes, 2) * self.size
@@ -147,11 +153,33 @@ class Scene:
         Assumes that all accelerations and velocities have been set accordingly.
         :return: None
         """
+        if self.colony:
+            self.colony.move(self.params.dt)
+            return
         for ant in self.ant_list:
             ant.walk(self.params.dt)
         for n1, n2 in self.graph.edges():
             self.graph[n1][n2]['pheromone'] *= (1 - self.params.pheromone_decay) ** self.params.dt
 
+    @property
+    def ant_position_array(self):
+        """
+        Positions of all ants. Computed on demand, so only when drawing.
+        :return: array with a row for every ant
+        """
+        if self.colony:
+            return self.colony.positions()
+        return np.array([ant.position for ant in self.ant_list]).reshape(-1, 2)
+
+    def carrying_food(self):
+        """
+        Which ants are currently carrying food.
+        :return: boolean array with an entry for every ant
+        """
+        if self.colony:
+            return self.colony.has_food
+        return np.array([ant.has_food for ant in self.ant_list], dtype=bool)
+
     def step(self):
         """
         Compute all step functions in scene not related to planner functions.
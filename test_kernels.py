@@ -0,0 +1,138 @@
+import random
+
+import numpy as np
+import pytest
+
+import kernels
+from params import Parameters
+from scene import Scene
+
+requires_numba = pytest.mark.skipif(kernels.numba is None, reason='Numba is not installed')
+
+GRAPH_SEED = 5
+ANT_SEED = 11
+
+
+def make_scene(backend, num_ants, pheromone_deposit=300):
+    """
+    Create a scene with a fixed graph, without releasing the ants yet.
+
+    :param backend: kernel backend moving the ants
+    :param num_ants: number of ants
+    :param pheromone_deposit: deposit rate. Large by default, so that trails form within a short test
+    :return: scene instance
+    """
+    params = Parameters()
+    params.kernel_backend = backend
+    params.num_ants = num_ants
+    # Larger steps, so that ants find food and back trace within a short test
+    params.dt = 0.03
+    params.pheromone_deposit = pheromone_deposit
+    # No seeding by the scene or the ants; the tests seed the random streams themselves
+    params.seed = 0
+    random.seed(GRAPH_SEED)
+    np.random.seed(GRAPH_SEED)
+    scene = Scene()
+    scene.total_ants = num_ants
+    scene.params = params
+    scene._create_graph()
+    return scene
+
+
+def release(scene, backend):
+    """
+    Seed the random stream of the backend and release the ants of the scene.
+
+    :param scene: scene created by make_scene
+    :param backend: kernel backend moving the ants
+    :return: None
+    """
+    kernels.seed(backend, ANT_SEED)
+    scene._create_colony()
+
+
+def pheromone(scene):
+    return np.array([scene.graph[n1][n2]['pheromone'] for n1, n2 in scene.graph.edges()])
+
+
+def run(scene, backend, steps):
+    """
+    Release the ants of the scene and record where they are heading and whether they carry food at every step.
+
+    :param scene: scene created by make_scene
+    :param backend: kernel backend moving the ants
+    :param steps: number of time steps
+    :return: list of (to nodes, has food) per step
+    """
+    release(scene, backend)
+    history = []
+    for _ in range(steps):
+        scene.move()
+        if scene.colony:
+            history.append((scene.colony.to_node.tolist(), scene.colony.has_food.tolist()))
+        else:
+            history.append(([ant.to_node for ant in scene.ant_list], [ant.has_food for ant in scene.ant_list]))
+    return history
+
+
+def test_numpy_kernel_matches_ant_objects():
+    """
+    Without pheromone deposits, the order of depositing and picking edges does not matter,
+    so the NumPy kernel moves the ants exactly like Ant.walk and Ant.pick_new_edge.
+    Both share the random stream of NumPy, so each runs to completion on its own.
+    """
+    reference = run(make_scene('python', 50, pheromone_deposit=0), 'python', 3000)
+    vectorized = run(make_scene('numpy', 50, pheromone_deposit=0), 'numpy', 3000)
+    for step, (expected, actual) in enumerate(zip(reference, vectorized)):
+        assert actual == expected, step
+    # Make sure food was carried all the way back to the nest along the back trace
+    carrying = np.array([has_food for _, has_food in reference])
+    assert (carrying[:-1] & ~carrying[1:]).any()
+
+
+@requires_numba
+def test_numba_kernel_matches_ant_objects():
+    """
+    With the same random stream, the compiled kernel moves the ants exactly like Ant.walk and Ant.pick_new_edge.
+    """
+    reference = make_scene('python', 30)
+    colony_scene = make_scene('numba', 30)
+    # Seeding the compiled stream also seeds NumPy, so the ant objects go last
+    release(colony_scene, 'numba')
+    release(reference, 'python')
+    colony = colony_scene.colony
+    carried = 0
+    for step in range(3000):
+        reference.move()
+        colony_scene.move()
+        ants = reference.ant_list
+        assert colony.from_node.tolist() == [ant.from_node for ant in ants], step
+        assert colony.to_node.tolist() == [ant.to_node for ant in ants], step
+        assert colony.has_food.tolist() == [ant.has_food for ant in ants], step
+        assert np.allclose(colony.progress, [ant.process_on_edge for ant in ants], atol=1e-4), step
+        assert np.allclose(pheromone(colony_scene), pheromone(reference)), step
+        carried += colony.has_food.sum()
+    assert np.allclose(colony_scene.ant_position_array, reference.ant_position_array, atol=1e-5)
+    # Make sure the back trace has been exercised
+    assert carried > 0
+
+
+@requires_numba
+def test_numpy_kernel_agrees_with_numba_kernel():
+    """
+    The NumPy kernel deposits all pheromone before any ant picks an edge, so it only agrees with the
+    compiled kernel on the behaviour of the colony as a whole.
+    """
+    scenes = {}
+    for backend in ('numpy', 'numba'):
+        scenes[backend] = make_scene(backend, 2000)
+        release(scenes[backend], backend)
+        for _ in range(1500):
+            scenes[backend].move()
+    numpy_colony, numba_colony = scenes['numpy'].colony, scenes['numba'].colony
+    assert numba_colony.has_food.mean() > 0
+    assert numpy_colony.has_food.mean() == pytest.approx(numba_colony.has_food.mean(), abs=0.05)
+    # Both colonies should mark the same trails, with about the same share of all pheromone on each edge
+    numpy_share = numpy_colony.pheromone / numpy_colony.pheromone.sum()
+    numba_share = numba_colony.pheromone / numba_colony.pheromone.sum()
+    assert np.allclose(numpy_share, numba_share, atol=0.1)
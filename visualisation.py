@@ -155,11 +155,11 @@ class VisualScene:
         :return: None
         """
         start_pos_array, end_pos_array = self.get_visual_ant_coordinates()
-        for ant in self.scene.ant_list:
-            index = ant.index
+        carrying_food = self.scene.carrying_food()
+        for index in range(self.scene.total_ants):
             self.canvas.create_oval(start_pos_array[index, 0], start_pos_array[index, 1],
                                     end_pos_array[index, 0], end_pos_array[index, 1],
-                                    fill=ant.color)
+                                    fill='orange' if carrying_food[index] else 'brown')
 
     def get_visual_ant_coordinates(self):
         """
@@ -167,9 +167,9 @@ class VisualScene:
         Uses vectorized operations for speed increments
         :return: relative start coordinates, relative end coordinates.
         """
-        rel_pos_array = self.scene.ant_position_array / self.scene.size
-        rel_size_array = np.ones(
-            self.scene.ant_position_array.shape) * self.params.ant_size / self.scene.size * self.size
+        ant_position_array = self.scene.ant_position_array
+        rel_pos_array = ant_position_array / self.scene.size
+        rel_size_array = np.ones(ant_position_array.shape) * self.params.ant_size / self.scene.size * self.size
         vis_pos_array = np.hstack((rel_pos_array[:, 0][:, None], 1 - rel_pos_array[:, 1][:, None])) * self.size
         start_pos_array = vis_pos_array - 0.5 * rel_size_array
         end_pos_array = vis_pos_array + 0.5 * rel_size_array